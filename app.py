@@ -1,9 +1,11 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import FileResponse
+import hashlib
 import json
 import os
+import sqlite3
 import subprocess
 import sys
 from pathlib import Path
@@ -12,11 +14,16 @@ import asyncio
 from typing import Dict, Any, Optional
 import logging
 
+from comentions import load_index
+from exporter import SNAPSHOT_DIR
+from jobstore import JobStore
+from responses import CompressedBodyCache, FastJSONResponse, accepted_encodings, dumps
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = FastAPI(title="WSB Sentiment Analysis API", version="1.0.0")
+app = FastAPI(title="WSB Sentiment Analysis API", version="1.0.0", default_response_class=FastJSONResponse)
 
 # Add CORS middleware to allow frontend to call the API
 app.add_middleware(
@@ -27,21 +34,57 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Global state to track analysis status
-analysis_status = {
-    "is_running": False,
-    "last_run": None,
-    "error": None,
-    "posts_count": 0,
-    "sentiment_count": 0
-}
+# Job state, locking and result snapshots live in a shared SQLite file so
+# every uvicorn worker sees the same status and only one runs each analysis.
+# The file is opened on first use, so a read-only deploy can still import the app.
+store = JobStore(job_timeout=300)
+
+# Encoded (and compressed) bodies of the large endpoints, reused until the snapshot changes
+body_cache = CompressedBodyCache()
+
+def _read_store(read, kind):
+    try:
+        return read(kind)
+    except sqlite3.Error as e:
+        # an unwritable or broken state DB must not take down the file-backed endpoints
+        logger.warning(f"State DB unavailable, serving {kind} from disk: {e}")
+        return None
+
+def _file_is_newer(path, snapshot):
+    """True if `path` was written after `snapshot` was published (e.g. a manual analyze_wsb.py run)."""
+    return path.exists() and path.stat().st_mtime > datetime.fromisoformat(snapshot["updated_at"]).timestamp()
+
+def _snapshot_response(request, kind, path):
+    """
+    Latest result set as {kind: [...], "count": n}: the shared snapshot, or the file
+    on disk when it is newer or there is no snapshot. Returns None if neither exists.
+    """
+    info = _read_store(store.get_snapshot_info, kind)
+    mtime = path.stat().st_mtime_ns if path.exists() else None
+    if info is None and mtime is None:
+        return None
+    probe = (info and info["token"], mtime)
 
-def run_wsb_analysis():
+    def build():
+        # one read; the version comes from the same row/bytes as the body
+        snapshot = _read_store(store.get_snapshot, kind)
+        if snapshot is None or _file_is_newer(path, snapshot):
+            raw = path.read_bytes()
+            data = json.loads(raw)
+            return f"file-{hashlib.sha256(raw).hexdigest()[:16]}", dumps({kind: data, "count": len(data)})
+        # the stored payload is already JSON, so splice it in instead of re-encoding
+        body = b''.join([b'{"', kind.encode(), b'":', snapshot["payload"].encode("utf-8"),
+                         b',"count":', str(snapshot["count"]).encode(), b'}'])
+        return snapshot["token"], body
+
+    return body_cache.respond(request, kind, probe, build)
+
+def run_wsb_analysis(job_id):
     """Run the WSB analysis in the background"""
+    error_msg = None
+    posts_count = sentiment_count = 0
     try:
-        logger.info("Starting WSB analysis...")
-        analysis_status["is_running"] = True
-        analysis_status["error"] = None
+        logger.info(f"Starting WSB analysis (job {job_id})...")
         
         # Change to the codered directory
         os.chdir(Path(__file__).parent)
@@ -54,33 +97,48 @@ def run_wsb_analysis():
         if result.returncode != 0:
             raise Exception(f"Analysis failed: {result.stderr}")
         
-        # Count the results
+        # Publish the results as shared snapshots
         posts_path = Path("posts.json")
         sentiment_path = Path("sentiment_results.json")
         
         if posts_path.exists():
             with open(posts_path, 'r', encoding='utf-8') as f:
                 posts_data = json.load(f)
-                analysis_status["posts_count"] = len(posts_data)
+            store.publish_snapshot("posts", posts_data)
+            posts_count = len(posts_data)
         
         if sentiment_path.exists():
             with open(sentiment_path, 'r', encoding='utf-8') as f:
                 sentiment_data = json.load(f)
-                analysis_status["sentiment_count"] = len(sentiment_data)
+            store.publish_snapshot("sentiment", sentiment_data)
+            sentiment_count = len(sentiment_data)
         
-        analysis_status["last_run"] = datetime.now().isoformat()
-        logger.info(f"WSB analysis completed successfully. Posts: {analysis_status['posts_count']}, Sentiment: {analysis_status['sentiment_count']}")
+        logger.info(f"WSB analysis completed successfully. Posts: {posts_count}, Sentiment: {sentiment_count}")
         
     except subprocess.TimeoutExpired:
         error_msg = "Analysis timed out after 5 minutes"
         logger.error(error_msg)
-        analysis_status["error"] = error_msg
     except Exception as e:
         error_msg = f"Analysis failed: {str(e)}"
         logger.error(error_msg)
-        analysis_status["error"] = error_msg
     finally:
-        analysis_status["is_running"] = False
+        store.finish_job(job_id, error=error_msg, posts_count=posts_count, sentiment_count=sentiment_count)
+
+# Optional continuous ingestion inside the API process (WSB_INGEST=1)
+ingestion = None
+
+@app.on_event("startup")
+async def start_ingestion():
+    global ingestion
+    if os.getenv("WSB_INGEST") == "1":
+        from ingest import service_from_env
+        ingestion = service_from_env(store=store)
+        ingestion.start()
+
+@app.on_event("shutdown")
+async def stop_ingestion():
+    if ingestion is not None:
+        ingestion.stop()
 
 @app.get("/")
 async def root():
@@ -89,46 +147,93 @@ async def root():
 @app.get("/api/status")
 async def get_status():
     """Get the current status of the analysis"""
-    return analysis_status
+    return store.status()
 
 @app.post("/api/analyze")
 async def start_analysis(background_tasks: BackgroundTasks):
     """Start a new WSB analysis"""
-    if analysis_status["is_running"]:
+    job_id = store.try_start_job()
+    if job_id is None:
+        if store.blocking_lease() == "ingest":
+            raise HTTPException(status_code=409, detail="Continuous ingestion is running; results are already kept fresh")
         raise HTTPException(status_code=409, detail="Analysis is already running")
     
     # Start the analysis in the background
-    background_tasks.add_task(run_wsb_analysis)
+    background_tasks.add_task(run_wsb_analysis, job_id)
     
     return {"message": "Analysis started", "status": "running"}
 
+@app.get("/api/ingest/status")
+async def get_ingest_status():
+    """Get the status of the continuous ingestion service"""
+    if ingestion is None:
+        return {"is_running": False, "error": "Ingestion disabled (set WSB_INGEST=1)"}
+    return ingestion.status()
+
+# Plain def: FastAPI runs these two in its threadpool, keeping SQLite reads and
+# compression of multi-MB bodies off the event loop
 @app.get("/api/posts")
-async def get_posts():
+def get_posts(request: Request):
     """Get the latest posts data"""
-    posts_path = Path("posts.json")
-    if not posts_path.exists():
-        raise HTTPException(status_code=404, detail="No posts data found")
-    
     try:
-        with open(posts_path, 'r', encoding='utf-8') as f:
-            posts_data = json.load(f)
-        return {"posts": posts_data, "count": len(posts_data)}
+        response = _snapshot_response(request, "posts", Path("posts.json"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading posts: {str(e)}")
+    if response is None:
+        raise HTTPException(status_code=404, detail="No posts data found")
+    return response
 
 @app.get("/api/sentiment")
-async def get_sentiment():
+def get_sentiment(request: Request):
     """Get the latest sentiment analysis results"""
-    sentiment_path = Path("sentiment_results.json")
-    if not sentiment_path.exists():
-        raise HTTPException(status_code=404, detail="No sentiment data found")
-    
     try:
-        with open(sentiment_path, 'r', encoding='utf-8') as f:
-            sentiment_data = json.load(f)
-        return {"sentiment": sentiment_data, "count": len(sentiment_data)}
+        response = _snapshot_response(request, "sentiment", Path("sentiment_results.json"))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error reading sentiment data: {str(e)}")
+    if response is None:
+        raise HTTPException(status_code=404, detail="No sentiment data found")
+    return response
+
+@app.get("/api/tickers/{sym}/related")
+async def get_related_tickers(sym: str, limit: int = Query(10, ge=1, le=100)):
+    """Get the tickers most often mentioned alongside `sym`"""
+    try:
+        index = load_index()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error reading co-mention index: {str(e)}")
+    if index is None:
+        raise HTTPException(status_code=404, detail="No co-mention index found")
+
+    sym = sym.upper()
+    related = index.related(sym, limit=limit)
+    return {
+        "ticker": sym,
+        "mentions": index.mentions.get(sym, 0),
+        "related": related,
+        "count": len(related),
+    }
+
+@app.get("/api/snapshots/{name:path}")
+async def get_snapshot_file(name: str, request: Request):
+    """Serve an exported snapshot shard, picking the pre-compressed variant the client accepts"""
+    root = SNAPSHOT_DIR.resolve()
+    path = (root / name).resolve()
+    if root not in path.parents or path.suffix != ".json" or not path.exists():
+        raise HTTPException(status_code=404, detail="Snapshot not found")
+
+    # hashed shards never change; the manifest must be revalidated
+    immutable = path.name != "manifest.json"
+    headers = {
+        "Cache-Control": "public, max-age=31536000, immutable" if immutable else "no-cache",
+        "Vary": "Accept-Encoding",
+    }
+    accepted = accepted_encodings(request)
+    for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+        variant = Path(f"{path}{suffix}")
+        if encoding in accepted and variant.exists():
+            headers["Content-Encoding"] = encoding
+            return FileResponse(variant, media_type="application/json", headers=headers)
+    return FileResponse(path, media_type="application/json", headers=headers)
 
 @app.get("/api/health")
 async def health_check():
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the /api/sentiment response path.
+
+Compares, on synthetic sentiment results:
+  - before: FastAPI's default path (jsonable_encoder + json.dumps) on data loaded
+    from an indent=2 file, sent uncompressed
+  - after:  the real api._snapshot_response path against a temporary state DB:
+    read the stored snapshot, splice it into the body, gzip it, then serve
+    repeat requests from CompressedBodyCache
+The dumps()/splice/compress rows isolate the individual steps.
+
+Usage: python bench_api.py [n_records ...]   (default: 10000 50000)
+"""
+
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# api.py's JobStore defaults to wsb_state.db next to the code, so point it at a scratch DB
+SCRATCH = Path(tempfile.mkdtemp())
+os.environ.setdefault("WSB_STATE_DB", str(SCRATCH / "bench_state.db"))
+
+from fastapi.encoders import jsonable_encoder
+from starlette.requests import Request
+
+import api
+from responses import brotli, dumps, orjson
+
+TICKERS = ["HIMS", "AAPL", "TSLA", "NVDA", "AMD", "GME", "MSFT", "SPY", "QQQ", "PLTR"]
+WORDS = "calls puts moon yolo tendies earnings squeeze dip rip bagholder diamond hands".split()
+
+
+def make_results(n, seed=0):
+    rng = random.Random(seed)
+    results = []
+    for i in range(n):
+        compound = round(rng.uniform(-1, 1), 4)
+        pos = round(rng.random() * 0.5, 3)
+        neg = round(rng.random() * 0.3, 3)
+        results.append({
+            "label": "bullish" if compound > 0.05 else "bearish" if compound < -0.05 else "neutral",
+            "compound": compound,
+            "pos": pos,
+            "neu": round(1 - pos - neg, 3),
+            "neg": neg,
+            "tickers": rng.sample(TICKERS, rng.randint(0, 3)),
+            "features": {
+                "emoji_count": rng.randint(0, 5),
+                "caps_ratio": round(rng.random() * 0.2, 3),
+                "len_tokens": rng.randint(1, 300),
+            },
+            "id": f"p{i:07d}",
+            "title": " ".join(rng.choices(WORDS, k=8)),
+            "permalink": f"https://www.reddit.com/r/wallstreetbets/comments/p{i:07d}/",
+            "created_utc": 1760000000 + i * 60,
+        })
+    return results
+
+
+def timed(fn, repeat=5):
+    """Best wall time of `repeat` runs, in milliseconds, plus the last result."""
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, out
+
+
+def make_request(encoding):
+    return Request({"type": "http", "method": "GET", "path": "/api/sentiment", "query_string": b"",
+                    "headers": [(b"accept-encoding", encoding.encode())]})
+
+
+def bench(n):
+    results = make_results(n)
+    indented = json.dumps(results, indent=2, ensure_ascii=False).encode("utf-8")
+    compact = json.dumps(results, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def before():
+        data = json.loads(indented)
+        content = jsonable_encoder({"sentiment": data, "count": len(data)})
+        return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None,
+                          separators=(",", ":")).encode("utf-8")
+
+    def encode_only():
+        return dumps({"sentiment": results, "count": len(results)})
+
+    def splice():
+        return b"".join([b'{"sentiment":', compact, b',"count":', str(len(results)).encode(), b"}"])
+
+    t_before, body_before = timed(before)
+    t_encode, _ = timed(encode_only)
+    t_splice, body = timed(splice)
+    t_gzip, body_gz = timed(lambda: gzip.compress(body, compresslevel=6), repeat=3)
+
+    # real endpoint path: each cold run publishes a new version, so it misses the cache
+    request = make_request("gzip")
+    no_file = SCRATCH / "sentiment_results.json"  # never written, so the snapshot is always served
+    def endpoint_cold():
+        api.store.publish_snapshot("sentiment", results)
+        start = time.perf_counter()
+        response = api._snapshot_response(request, "sentiment", no_file)
+        return time.perf_counter() - start, response
+    cold = [endpoint_cold() for _ in range(3)]
+    t_endpoint, endpoint_response = min(cold, key=lambda c: c[0])
+    t_endpoint *= 1000
+    t_cached, _ = timed(lambda: api._snapshot_response(request, "sentiment", no_file))
+    t_publish, _ = timed(lambda: api.store.publish_snapshot("sentiment", results), repeat=1)
+
+    rows = [
+        ("on-disk file, indent=2", len(indented), None),
+        ("on-disk file, compact", len(compact), None),
+        ("response, before (jsonable_encoder)", len(body_before), t_before),
+        (f"step: dumps() with {'orjson' if orjson else 'json'} only", len(body), t_encode),
+        ("step: splice stored payload only", len(body), t_splice),
+        ("step: gzip only", len(body_gz), t_gzip),
+        ("write: publish_snapshot (per flush)", len(compact), t_publish),
+        ("endpoint, gzip, new version", len(endpoint_response.body), t_endpoint),
+        ("endpoint, gzip, cached version", len(endpoint_response.body), t_cached),
+    ]
+    if brotli is not None:
+        t_br, body_br = timed(lambda: brotli.compress(body, quality=5), repeat=3)
+        rows.append(("step: brotli only", len(body_br), t_br))
+
+    print(f"\n{n:,} records")
+    print(f"{'':40} {'bytes':>12} {'ms':>10}")
+    for label, size, ms in rows:
+        print(f"{label:40} {size:>12,} {'' if ms is None else f'{ms:10.2f}':>10}")
+
+
+if __name__ == "__main__":
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10000, 50000]
+    for n in sizes:
+        bench(n)
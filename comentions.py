@@ -0,0 +1,120 @@
+import json
+import os
+from itertools import combinations
+from pathlib import Path
+
+INDEX_PATH = Path("comentions.json")
+
+# Post ids remembered for dedup. Older ids are dropped on save so the file stays
+# bounded; a post that old would only be re-counted if it were fed in again.
+MAX_SEEN = 10000
+
+
+class CoMentionIndex:
+    """
+    Sparse ticker x ticker co-mention index.
+      - counts[a][b]  → number of posts mentioning both a and b (symmetric)
+      - weights[a][b] → sum of the VADER compound of those posts (unrounded)
+      - mentions[a]   → number of posts mentioning a at all
+    Posts are keyed by id, so feeding the same batch twice does not double count.
+    Only the newest MAX_SEEN ids are kept for that check.
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.weights = {}
+        self.mentions = {}
+        self.seen = {}  # post id -> None, insertion-ordered so the oldest can be trimmed
+
+    def add(self, result) -> bool:
+        """Fold one sentiment result into the index. Returns False if already seen."""
+        post_id = result.get("id")
+        if post_id in self.seen:
+            return False
+        self.seen[post_id] = None
+
+        tickers = sorted(set(result.get("tickers") or []))
+        compound = result.get("compound", 0.0)
+        for sym in tickers:
+            self.mentions[sym] = self.mentions.get(sym, 0) + 1
+        for a, b in combinations(tickers, 2):
+            self._bump(a, b, compound)
+            self._bump(b, a, compound)
+        return True
+
+    def update(self, results) -> int:
+        """Fold a whole analyzed batch into the index. Returns how many posts were new."""
+        return sum(1 for res in results if self.add(res))
+
+    def _bump(self, a, b, compound):
+        row = self.counts.setdefault(a, {})
+        row[b] = row.get(b, 0) + 1
+        wrow = self.weights.setdefault(a, {})
+        wrow[b] = wrow.get(b, 0.0) + compound
+
+    def related(self, sym: str, limit: int = 10):
+        """Tickers most often mentioned alongside `sym`, strongest first."""
+        sym = sym.upper()
+        row = self.counts.get(sym, {})
+        out = []
+        for other, count in row.items():
+            weight = self.weights[sym][other]
+            out.append({
+                "ticker": other,
+                "count": count,
+                "weight": round(weight, 4),
+                "avg_compound": round(weight / count, 4),
+            })
+        out.sort(key=lambda r: (-r["count"], -abs(r["weight"]), r["ticker"]))
+        return out[:limit]
+
+    # --- persistence ---
+    def to_dict(self):
+        return {
+            "mentions": self.mentions,
+            "counts": self.counts,
+            "weights": self.weights,
+            "seen": list(self.seen),
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        index = cls()
+        index.mentions = data.get("mentions", {})
+        index.counts = data.get("counts", {})
+        index.weights = data.get("weights", {})
+        index.seen = dict.fromkeys(data.get("seen", []))
+        return index
+
+    @classmethod
+    def load(cls, path=INDEX_PATH):
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def save(self, path=INDEX_PATH):
+        # write-then-rename so API readers never see a half-written file
+        if len(self.seen) > MAX_SEEN:
+            self.seen = dict.fromkeys(list(self.seen)[-MAX_SEEN:])
+        path = Path(path)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+
+
+# --- Cached read path for the API ---
+_cache = {"mtime": None, "index": None}
+
+def load_index(path=INDEX_PATH):
+    """Load the index once and reuse it until the file on disk changes."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    mtime = path.stat().st_mtime_ns
+    if _cache["mtime"] != mtime:
+        _cache["index"] = CoMentionIndex.load(path)
+        _cache["mtime"] = mtime
+    return _cache["index"]
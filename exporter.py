@@ -0,0 +1,202 @@
+"""
+Static snapshot exporter for the dashboard deployment.
+
+Splits sentiment results into small shards under frontend/public/snapshots/:
+  - summary.<hash>.json        → totals + per-ticker counts (enough for first paint)
+  - tickers/<SYM>.<hash>.json  → every result mentioning that ticker
+  - days/<YYYY-MM-DD>.<hash>.json → every result posted that day (UTC)
+  - manifest.json              → points at the current hashed files
+
+Shards are content-hashed so they can be cached forever; only manifest.json
+changes name-stably. Each file is also written pre-compressed as .gz and,
+when the optional `brotli` package is installed, .br, for the self-hosted
+/api/snapshots route (Vercel compresses static files at the edge itself).
+
+Exports are serialized with a lock file, every file is written to a temp name
+and renamed into place (identity file last, so its existence means the set is
+complete), and shards are pruned only once three newer generations no longer
+reference them. The lock and generation history live beside the state DB, not
+in the published snapshot directory.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+from jobstore import STATE_DB
+
+try:
+    import brotli
+except ImportError:  # optional: only .gz siblings are written without it
+    brotli = None
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+SNAPSHOT_DIR = Path("frontend/public/snapshots")
+UNDATED = "undated"
+GENERATIONS_KEPT = 3  # current manifest + the two before it
+LOCK_PATH = STATE_DB.with_name(STATE_DB.name + ".export-lock")
+HISTORY_PATH = STATE_DB.with_name(STATE_DB.name + ".generations.json")  # {out_dir: [file sets]}
+LEGACY_NAMES = (".export.lock", ".generations")  # older exports kept these in out_dir
+
+
+def _encode(data) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _write_shard(out_dir, subdir, name, data):
+    """Write `name.<hash>.json` plus compressed siblings. Returns the relative path."""
+    body = _encode(data)
+    digest = hashlib.sha256(body).hexdigest()[:12]
+    rel = f"{subdir}/{name}.{digest}.json" if subdir else f"{name}.{digest}.json"
+    path = out_dir / rel
+    if not _complete(path):  # same hash → same bytes, nothing to do
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _write_variants(path, body)
+    return rel
+
+def _complete(path):
+    return path.exists() and all(Path(f"{path}{suffix}").exists() for suffix in _suffixes())
+
+def _suffixes():
+    return (".gz", ".br") if brotli is not None else (".gz",)
+
+def _replace_bytes(path, body):
+    tmp = Path(f"{path}.{os.getpid()}.tmp")
+    tmp.write_bytes(body)
+    os.replace(tmp, path)
+
+def _write_variants(path, body):
+    # compressed siblings first, identity last: the identity file existing means the set is complete
+    _replace_bytes(Path(f"{path}.gz"), gzip.compress(body, compresslevel=9, mtime=0))
+    if brotli is not None:
+        _replace_bytes(Path(f"{path}.br"), brotli.compress(body, quality=11))
+    elif Path(f"{path}.br").exists():
+        Path(f"{path}.br").unlink()  # don't leave a stale variant behind
+    _replace_bytes(path, body)
+
+@contextmanager
+def _export_lock():
+    """Exclusive lock across processes; released by the OS if the holder dies."""
+    LOCK_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(LOCK_PATH, "a+") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:  # LK_LOCK gives up after ~10s; keep waiting
+                    time.sleep(1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+def _load_histories():
+    if HISTORY_PATH.exists():
+        with open(HISTORY_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+def _load_history(histories, out_dir):
+    """File sets of recent generations, oldest first. Bootstraps from manifest.json."""
+    key = str(out_dir.resolve())
+    if key in histories:
+        return histories[key]
+    legacy_path = out_dir / ".generations"
+    if legacy_path.exists():
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    manifest_path = out_dir / "manifest.json"
+    if manifest_path.exists():
+        with open(manifest_path, "r", encoding="utf-8") as f:
+            return [sorted(_referenced(json.load(f)))]
+    return []
+
+def _day_of(result):
+    ts = result.get("created_utc")
+    if not ts:
+        return UNDATED
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d")
+
+def _summarize(results, by_ticker):
+    labels = defaultdict(int)
+    for res in results:
+        labels[res["label"]] += 1
+    tickers = {}
+    for sym, rows in by_ticker.items():
+        sym_labels = defaultdict(int)
+        for res in rows:
+            sym_labels[res["label"]] += 1
+        tickers[sym] = {
+            "count": len(rows),
+            "avg_compound": round(sum(r["compound"] for r in rows) / len(rows), 4),
+            "labels": dict(sym_labels),
+        }
+    return {
+        "count": len(results),
+        "labels": dict(labels),
+        "tickers": dict(sorted(tickers.items(), key=lambda kv: -kv[1]["count"])),
+    }
+
+def _referenced(manifest):
+    files = {manifest["summary"]}
+    files.update(entry["file"] for entry in manifest["tickers"].values())
+    files.update(entry["file"] for entry in manifest["days"].values())
+    return files
+
+def export_snapshots(results, out_dir=SNAPSHOT_DIR):
+    """Shard `results` into out_dir and rewrite manifest.json. Returns the manifest."""
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    by_ticker, by_day = defaultdict(list), defaultdict(list)
+    for res in results:
+        for sym in res.get("tickers") or []:
+            by_ticker[sym].append(res)
+        by_day[_day_of(res)].append(res)
+
+    with _export_lock():
+        histories = _load_histories()
+        history = _load_history(histories, out_dir)
+
+        manifest = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "summary": _write_shard(out_dir, "", "summary", _summarize(results, by_ticker)),
+            "tickers": {sym: {"file": _write_shard(out_dir, "tickers", sym, rows), "count": len(rows)}
+                        for sym, rows in sorted(by_ticker.items())},
+            "days": {day: {"file": _write_shard(out_dir, "days", day, rows), "count": len(rows)}
+                     for day, rows in sorted(by_day.items())},
+        }
+        _write_variants(out_dir / "manifest.json", _encode(manifest))
+
+        # clients holding one of the last few manifests can still fetch its shards
+        history = (history + [sorted(_referenced(manifest))])[-GENERATIONS_KEPT:]
+        histories[str(out_dir.resolve())] = history
+        _replace_bytes(HISTORY_PATH, _encode(histories))
+        for name in LEGACY_NAMES:
+            (out_dir / name).unlink(missing_ok=True)
+        keep = set().union(*history)
+        for path in out_dir.rglob("*.json*"):
+            rel = path.relative_to(out_dir).as_posix()
+            base = rel.removesuffix(".gz").removesuffix(".br")
+            if base != "manifest.json" and base not in keep:
+                path.unlink()
+
+    return manifest
@@ -12,12 +12,48 @@ type SentimentItem = {
   features?: { emoji_count?: number; caps_ratio?: number; len_tokens?: number };
 };
 
+// Static snapshot shards written by exporter.py (see DEPLOYMENT.md)
+type ShardEntry = { file: string; count: number };
+type SnapshotManifest = {
+  generated_at: string;
+  summary: string;
+  tickers: Record<string, ShardEntry>;
+  days: Record<string, ShardEntry>;
+};
+type SnapshotSummary = {
+  count: number;
+  labels: Record<string, number>;
+  tickers: Record<string, { count: number; avg_compound: number; labels: Record<string, number> }>;
+};
+
+const SNAPSHOT_BASE = process.env.NODE_ENV === 'production'
+  ? '/snapshots'
+  : 'http://localhost:8000/api/snapshots';
+
+// Day shards newest first, "undated" last
+function orderedDays(m: SnapshotManifest): string[] {
+  const days = Object.keys(m.days).sort().reverse();
+  return [...days.filter((d) => d !== "undated"), ...days.filter((d) => d === "undated")];
+}
+
+async function fetchJson<T>(url: string): Promise<T> {
+  const response = await fetch(url);
+  if (!response.ok) throw new Error(`HTTP ${response.status}`);
+  return response.json();
+}
+
 export default function WSBSentimentDashboard() {
   const [data, setData] = useState<SentimentItem[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [analysisRunning, setAnalysisRunning] = useState(false);
   const [lastAnalysis, setLastAnalysis] = useState<string | null>(null);
+  const [manifest, setManifest] = useState<SnapshotManifest | null>(null);
+  const [summary, setSummary] = useState<SnapshotSummary | null>(null);
+  // Day shards loaded so far (newest first on first paint, older ones on demand)
+  const [dayShards, setDayShards] = useState<Record<string, SentimentItem[]>>({});
+  const [tickerRows, setTickerRows] = useState<SentimentItem[] | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
   // filters
   const [q, setQ] = useState("");
@@ -25,6 +61,21 @@ export default function WSBSentimentDashboard() {
   const [ticker, setTicker] = useState("");
 
   // API functions
+  // First paint: manifest + summary + the newest day shard (a few KB), not the full corpus
+  const fetchSnapshotData = useCallback(async () => {
+    const m = await fetchJson<SnapshotManifest>(`${SNAPSHOT_BASE}/manifest.json`);
+    const day = orderedDays(m)[0];
+    const [s, latest] = await Promise.all([
+      fetchJson<SnapshotSummary>(`${SNAPSHOT_BASE}/${m.summary}`),
+      day ? fetchJson<SentimentItem[]>(`${SNAPSHOT_BASE}/${m.days[day].file}`) : Promise.resolve([]),
+    ]);
+    setManifest(m);
+    setSummary(s);
+    setDayShards(day ? { [day]: latest } : {});
+    setLastAnalysis(m.generated_at);
+    return latest;
+  }, []);
+
   const fetchSentimentData = useCallback(async () => {
     try {
       const apiUrl = process.env.NODE_ENV === 'production' 
@@ -113,7 +164,15 @@ export default function WSBSentimentDashboard() {
   const loadData = useCallback(async () => {
     try {
       setLoading(true);
-      const sentimentData = await fetchSentimentData();
+      let sentimentData: SentimentItem[];
+      try {
+        sentimentData = await fetchSnapshotData();
+      } catch (snapshotError) {
+        console.warn("Snapshots unavailable, loading full sentiment data:", snapshotError);
+        setManifest(null);
+        setSummary(null);
+        sentimentData = await fetchSentimentData();
+      }
       setData(sentimentData);
       setError(null);
     } catch (error: unknown) {
@@ -145,26 +204,72 @@ export default function WSBSentimentDashboard() {
     } finally {
       setLoading(false);
     }
-  }, [fetchSentimentData]);
+  }, [fetchSnapshotData, fetchSentimentData]);
 
   useEffect(() => {
     loadData();
   }, [loadData]);
 
+  // With snapshots, picking a ticker loads just that ticker's shard; clearing it shows the loaded days again
+  useEffect(() => {
+    setTickerRows(null);
+    if (!manifest || !ticker || !manifest.tickers[ticker]) return;
+    let cancelled = false;
+    fetchJson<SentimentItem[]>(`${SNAPSHOT_BASE}/${manifest.tickers[ticker].file}`)
+      .then((rows) => { if (!cancelled) setTickerRows(rows); })
+      .catch((err) => console.error("Error loading ticker shard:", err));
+    return () => { cancelled = true; };
+  }, [manifest, ticker]);
+
+  const missingDays = useMemo(
+    () => (manifest ? orderedDays(manifest).filter((d) => !(d in dayShards)) : []),
+    [manifest, dayShards],
+  );
+
+  // Older day shards are fetched on demand: the next one, or all that are left
+  const loadEarlier = async (all: boolean) => {
+    if (!manifest || missingDays.length === 0) return;
+    const days = all ? missingDays : missingDays.slice(0, 1);
+    try {
+      setLoadingMore(true);
+      const shards = await Promise.all(
+        days.map((d) => fetchJson<SentimentItem[]>(`${SNAPSHOT_BASE}/${manifest.days[d].file}`)),
+      );
+      setDayShards((prev) => {
+        const next = { ...prev };
+        days.forEach((d, i) => { next[d] = shards[i]; });
+        return next;
+      });
+    } catch (err) {
+      console.error("Error loading day shards:", err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // What the list shows: the ticker shard, the loaded day shards, or the /api/sentiment fallback
+  const rows = useMemo(() => {
+    if (!manifest) return data;
+    // until the ticker shard arrives, the ticker filter below narrows the loaded days instead
+    if (ticker && tickerRows) return tickerRows;
+    return orderedDays(manifest).flatMap((d) => dayShards[d] ?? []);
+  }, [manifest, ticker, tickerRows, dayShards, data]);
+
   const allTickers = useMemo(() => {
+    if (summary) return Object.keys(summary.tickers).sort();
     const s = new Set<string>();
     data.forEach((d) => (d.tickers || []).forEach((t) => s.add(t)));
     return Array.from(s).sort();
-  }, [data]);
+  }, [data, summary]);
 
   const filtered = useMemo(() => {
-    let items = data;
+    let items = rows;
     if (label !== "all") items = items.filter((d) => (d.label || "").toLowerCase() === label);
     if (ticker) items = items.filter((d) => (d.tickers || []).includes(ticker));
     const qq = q.trim().toLowerCase();
     if (qq) items = items.filter((d) => d.title.toLowerCase().includes(qq));
     return items;
-  }, [data, label, ticker, q]);
+  }, [rows, label, ticker, q]);
 
   const cardColor = (lbl: string) =>
     lbl === "bullish" ? "#e8f7ee" : lbl === "bearish" ? "#fde8e8" : "#f3f4f6";
@@ -193,6 +298,11 @@ export default function WSBSentimentDashboard() {
         <div>
           <h1 style={{ fontSize: 24, fontWeight: 700, marginBottom: 8 }}>WSB Sentiment Dashboard</h1>
           <p style={{ color: "#6b7280", margin: 0 }}>Green = bullish · Red = bearish · Gray = neutral</p>
+          {summary && (
+            <p style={{ color: "#6b7280", fontSize: 14, margin: "4px 0 0 0" }}>
+              {summary.count} posts · {summary.labels.bullish ?? 0} bullish · {summary.labels.bearish ?? 0} bearish · {summary.labels.neutral ?? 0} neutral
+            </p>
+          )}
           {lastAnalysis && (
             <p style={{ color: "#6b7280", fontSize: 14, margin: "4px 0 0 0" }}>
               Last analysis: {new Date(lastAnalysis).toLocaleString()}
@@ -244,12 +354,34 @@ export default function WSBSentimentDashboard() {
           <option value="">All tickers</option>
           {allTickers.map((t) => (
             <option key={t} value={t}>
-              {t}
+              {summary ? `${t} (${summary.tickers[t].count})` : t}
             </option>
           ))}
         </select>
       </div>
 
+      {manifest && !ticker && missingDays.length > 0 && (
+        <div style={{ display: "flex", gap: 8, alignItems: "center", flexWrap: "wrap", color: "#6b7280", fontSize: 14, marginBottom: 12 }}>
+          <span>
+            Showing {rows.length} of {summary?.count ?? rows.length} posts{q.trim() ? "; search covers loaded days only" : ""}.
+          </span>
+          <button
+            onClick={() => loadEarlier(false)}
+            disabled={loadingMore}
+            style={{ padding: "6px 10px", borderRadius: 8, border: "1px solid #d1d5db", background: "white", cursor: loadingMore ? "not-allowed" : "pointer" }}
+          >
+            Load {missingDays[0]} ({manifest.days[missingDays[0]].count} posts)
+          </button>
+          <button
+            onClick={() => loadEarlier(true)}
+            disabled={loadingMore}
+            style={{ padding: "6px 10px", borderRadius: 8, border: "1px solid #d1d5db", background: "white", cursor: loadingMore ? "not-allowed" : "pointer" }}
+          >
+            Load all
+          </button>
+        </div>
+      )}
+
       {loading && <div style={{ color: "#6b7280" }}>Loading…</div>}
       {analysisRunning && (
         <div style={{ background: "#dbeafe", border: "1px solid #3b82f6", color: "#1e40af", padding: 12, borderRadius: 8, marginBottom: 12 }}>
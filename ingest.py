@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Continuous ingestion daemon.
+
+Polls r/wallstreetbets on a schedule, pushes new posts through a bounded queue
+into a pool of scoring workers, and keeps posts.json / sentiment_results.json /
+comentions.json and the static dashboard snapshots fresh without anyone hitting POST /api/analyze.
+
+Run it beside the API with `python ingest.py`, or inside the API process by
+setting WSB_INGEST=1 before starting uvicorn. With several uvicorn workers each
+one starts the service, but only the holder of the shared "ingest" lease polls.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+from comentions import CoMentionIndex
+from exporter import export_snapshots
+from jobstore import JobStore, worker_id
+from scraper import fetch_wsb_posts
+from sentiment_simple import BasicSentiment, score_post
+
+logger = logging.getLogger(__name__)
+
+POSTS_PATH = Path("posts.json")
+SENTIMENT_PATH = Path("sentiment_results.json")
+
+
+def _load_json(path):
+    if not path.exists():
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _write_json(path, data):
+    # write-then-rename so API readers never see a half-written file
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+def _prepend(new, old):
+    """Merge two id-keyed dicts so `new` entries come first and win on conflicts."""
+    merged = dict(new)
+    merged.update((k, v) for k, v in old.items() if k not in new)
+    return merged
+
+
+class IngestionService:
+    """
+    One poller thread → bounded queue → `workers` scoring threads → one flusher thread.
+
+    The scoring threads share the GIL, so `workers` is concurrency, not parallelism:
+    VADER scores a post in about a millisecond while the scraper paces itself at ~2s
+    per post, so one worker keeps up and is the default.
+
+    Backpressure: when the queue is above `high_watermark` of its capacity the
+    poller skips the fetch and retries after `backoff` seconds; otherwise it only
+    asks Reddit for as many posts as there are free queue slots. When the queue
+    is full, `put` blocks the poller until scoring catches up.
+    """
+
+    def __init__(self, interval=300, batch_size=50, workers=1, queue_size=200,
+                 max_results=1000, flush_interval=5, high_watermark=0.75,
+                 backoff=30, source="new", store=None):
+        self.interval = interval
+        self.batch_size = batch_size
+        self.workers = workers
+        self.max_results = max_results
+        self.flush_interval = flush_interval
+        self.high_watermark = high_watermark
+        self.backoff = backoff
+        self.source = source
+        self.store = store or JobStore()
+        self.owner = worker_id()
+        self.lease_ttl = max(60, flush_interval * 6)
+        self._leader = False
+
+        self.queue = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._threads = []
+        self._pending = []  # (post, result) pairs scored but not yet flushed
+
+        self._reload()
+
+        self.stats = {
+            "is_running": False,
+            "is_leader": False,
+            "last_poll": None,
+            "last_flush": None,
+            "error": None,
+            "polled": 0,
+            "scored": 0,
+            "workers_alive": 0,
+            "backpressure_skips": 0,
+            "queue_size": 0,
+            "queue_capacity": queue_size,
+            "sentiment_count": len(self.results),
+        }
+
+    def _reload(self):
+        # newest first, keyed by post id so re-fetched posts replace old entries
+        self.posts = {p["id"]: p for p in _load_json(POSTS_PATH)}
+        self.results = {r["id"]: r for r in _load_json(SENTIMENT_PATH)}
+        self.index = CoMentionIndex.load()
+
+    def _hold_lease(self):
+        """Take or renew the ingest lease; reload state from disk when newly elected."""
+        leader = self.store.acquire_lease("ingest", self.owner, ttl=self.lease_ttl)
+        if leader and not self._leader:
+            with self._lock:
+                self._reload()
+            logger.info(f"{self.owner} is now the ingestion leader")
+        self._leader = self.stats["is_leader"] = leader
+        return leader
+
+    # --- lifecycle ---
+    def start(self):
+        if self._threads:
+            return
+        self._stop.clear()
+        self._threads = [threading.Thread(target=self._poll_loop, name="ingest-poller", daemon=True),
+                         threading.Thread(target=self._flush_loop, name="ingest-flusher", daemon=True)]
+        self._threads += [threading.Thread(target=self._score_loop, name=f"ingest-worker-{i}", daemon=True)
+                          for i in range(self.workers)]
+        for t in self._threads:
+            t.start()
+        self.stats["is_running"] = True
+        logger.info(f"Ingestion started: every {self.interval}s, {self.workers} workers, queue {self.queue.maxsize}")
+
+    def stop(self, timeout=10):
+        self._stop.set()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+        self._flush()
+        if self._leader:
+            self.store.release_lease("ingest", self.owner)
+            self._leader = self.stats["is_leader"] = False
+        self.stats["is_running"] = False
+        logger.info("Ingestion stopped")
+
+    def _workers_alive(self):
+        return sum(1 for t in self._threads if t.name.startswith("ingest-worker") and t.is_alive())
+
+    def status(self):
+        self.stats["queue_size"] = self.queue.qsize()
+        self.stats["workers_alive"] = self._workers_alive()
+        return dict(self.stats)
+
+    # --- poller ---
+    def _poll_loop(self):
+        while not self._stop.is_set():
+            if not self._hold_lease():
+                # another worker is polling; check back in case it goes away
+                self._stop.wait(self.lease_ttl)
+                continue
+
+            if self._workers_alive() == 0:
+                # nothing would drain the queue; keep the worker error visible instead of polling
+                self.stats["error"] = self.stats["error"] or "No scoring workers running"
+                logger.error(f"Not polling: {self.stats['error']}")
+                self._stop.wait(self.backoff)
+                continue
+
+            free = self.queue.maxsize - self.queue.qsize()
+            if self.queue.qsize() >= self.queue.maxsize * self.high_watermark:
+                self.stats["backpressure_skips"] += 1
+                logger.warning(f"Scoring is behind ({self.queue.qsize()} queued), skipping poll")
+                self._stop.wait(self.backoff)
+                continue
+
+            try:
+                with self._lock:
+                    seen = set(self.posts)
+                posts = fetch_wsb_posts(limit=min(self.batch_size, free), source=self.source,
+                                        seen_ids=seen, save=False)
+                self.stats["last_poll"] = datetime.now().isoformat()
+                self.stats["error"] = None
+            except Exception as e:
+                logger.error(f"Poll failed: {e}")
+                self.stats["error"] = f"Poll failed: {str(e)}"
+                self._stop.wait(self.backoff)
+                continue
+
+            for post in posts:
+                # blocks while the queue is full, but wakes up to honour stop()
+                while not self._stop.is_set():
+                    try:
+                        self.queue.put(post, timeout=1)
+                        self.stats["polled"] += 1
+                        break
+                    except queue.Full:
+                        continue
+
+            self._stop.wait(self.interval)
+
+    # --- scoring workers ---
+    def _score_loop(self):
+        try:
+            model = BasicSentiment()
+        except Exception as e:
+            logger.exception("Scoring worker failed to start")
+            self.stats["error"] = f"Scoring worker failed to start: {str(e)}"
+            return
+        while not self._stop.is_set():
+            try:
+                post = self.queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            try:
+                res = score_post(model, post)
+                with self._lock:
+                    self._pending.append((post, res))
+                    self.stats["scored"] += 1
+            except Exception as e:
+                logger.error(f"Scoring post {post.get('id')} failed: {e}")
+            finally:
+                self.queue.task_done()
+
+    # --- flusher ---
+    def _flush_loop(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                if self._leader:
+                    self._hold_lease()
+                self._flush()
+            except Exception as e:
+                logger.error(f"Flush failed: {e}")
+                self.stats["error"] = f"Flush failed: {str(e)}"
+
+    def _flush(self):
+        with self._lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return
+            if not self._leader:
+                # lost the lease: the new leader reloads from disk, so don't write over it
+                logger.warning(f"Dropping {len(batch)} scored posts, no longer the ingestion leader")
+                return
+            # newest batch goes to the front, then trim the tail
+            self.posts = _prepend({p["id"]: p for p, _ in batch}, self.posts)
+            self.results = _prepend({r["id"]: r for _, r in batch}, self.results)
+            for key in list(self.results)[self.max_results:]:
+                del self.results[key]
+            for key in list(self.posts)[self.max_results:]:
+                del self.posts[key]
+            posts, results = list(self.posts.values()), list(self.results.values())
+            added = self.index.update(r for _, r in batch)
+
+            _write_json(POSTS_PATH, posts)
+            _write_json(SENTIMENT_PATH, results)
+            self.index.save()
+            self.store.publish_snapshot("posts", posts)
+            self.store.publish_snapshot("sentiment", results)
+
+        # sharding + brotli is the slow part; don't hold up the scoring workers for it
+        export_snapshots(results)
+
+        self.stats["last_flush"] = datetime.now().isoformat()
+        self.stats["sentiment_count"] = len(results)
+        logger.info(f"Flushed {len(batch)} scored posts ({added} new co-mention posts)")
+
+
+def service_from_env(store=None):
+    """Build a service from WSB_INGEST_* environment variables."""
+    return IngestionService(
+        store=store,
+        interval=int(os.getenv("WSB_INGEST_INTERVAL", "300")),
+        batch_size=int(os.getenv("WSB_INGEST_BATCH", "50")),
+        workers=int(os.getenv("WSB_INGEST_WORKERS", "1")),
+        queue_size=int(os.getenv("WSB_INGEST_QUEUE", "200")),
+        max_results=int(os.getenv("WSB_INGEST_MAX_RESULTS", "1000")),
+        source=os.getenv("WSB_INGEST_SOURCE", "new"),
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    os.chdir(Path(__file__).parent)
+
+    service = service_from_env()
+    service.start()
+    print("Ingestion running. Press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(60)
+            print(service.status())
+    except KeyboardInterrupt:
+        service.stop()
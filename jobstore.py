@@ -0,0 +1,260 @@
+"""
+Shared job state for the API, backed by SQLite in WAL mode.
+
+Every uvicorn worker opens the same database file, so:
+  - /api/status reads the same job row no matter which worker answers
+  - try_start_job() is an atomic claim, so exactly one worker runs each analysis
+  - result snapshots are versioned rows any worker can read in parallel
+  - leases let exactly one worker own long-running duties (e.g. ingestion)
+
+Analysis jobs and the "ingest" lease exclude each other: both rewrite the same
+result files and snapshots, so only one writer may own them at a time.
+"""
+
+import json
+import os
+import socket
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+
+def _default_state_db():
+    """WSB_STATE_DB, else next to this file, else the temp dir on read-only deploys (Vercel)."""
+    if os.getenv("WSB_STATE_DB"):
+        return Path(os.environ["WSB_STATE_DB"]).resolve()
+    here = Path(__file__).resolve().parent
+    if os.access(here, os.W_OK):
+        return here / "wsb_state.db"
+    return Path(tempfile.gettempdir()) / "wsb_state.db"
+
+# Anchored to the code, not the cwd, so the API, `python ingest.py` and
+# analyze runs started from any directory all share one database
+STATE_DB = _default_state_db()
+
+# "<store_id>-<version>": unique even if the file is recreated and versions restart at 1
+SNAPSHOT_TOKEN = "m.value || '-' || s.version AS token"
+
+# Leases whose holder writes the same results an analysis job does
+EXCLUSIVE_LEASES = ("ingest",)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    status TEXT NOT NULL,              -- running | done | failed
+    owner TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    expires_at REAL NOT NULL,          -- unix time after which a running job counts as abandoned
+    finished_at TEXT,
+    error TEXT,
+    posts_count INTEGER DEFAULT 0,
+    sentiment_count INTEGER DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS snapshots (
+    kind TEXT PRIMARY KEY,             -- posts | sentiment
+    version INTEGER NOT NULL,
+    payload TEXT NOT NULL,             -- JSON text, stored as-is
+    count INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+def worker_id():
+    """Identify this process among the API workers."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobStore:
+    """
+    Thin wrapper over one SQLite file. Opens a short-lived connection per call, so it is thread-safe.
+    The file is created on first use, not at construction, so importing the API never touches disk.
+    """
+
+    def __init__(self, path=STATE_DB, job_timeout=300):
+        self.path = Path(path).resolve()  # API handlers chdir, so pin the location now
+        self.job_timeout = job_timeout
+        self._ready = False
+        self._init_lock = threading.Lock()
+
+    def _open(self):
+        # isolation_level=None → we issue BEGIN IMMEDIATE ourselves for write transactions
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _ensure_schema(self):
+        with self._init_lock:
+            if self._ready:
+                return
+            conn = self._open()
+            try:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.executescript(SCHEMA)
+                # random per-database id: versions restart at 1 if the file is recreated
+                conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('store_id', ?)", (uuid.uuid4().hex[:12],))
+                self._ready = True
+            finally:
+                conn.close()
+
+    @contextmanager
+    def _connect(self):
+        self._ensure_schema()
+        conn = self._open()
+        conn.execute("PRAGMA synchronous=NORMAL")
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _write(self):
+        """Serialized write transaction across all processes sharing the file."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    # --- analysis jobs ---
+    def try_start_job(self, owner=None):
+        """
+        Atomically claim the analysis slot.
+        Returns the new job id, or None if another worker already has a live job
+        or the ingestion lease is held (see blocking_lease()).
+        Running jobs past their expiry (their worker died) are marked failed and replaced.
+        """
+        now = time.time()
+        with self._write() as conn:
+            live = conn.execute(
+                "SELECT id FROM jobs WHERE status = 'running' AND expires_at > ?", (now,)
+            ).fetchone()
+            if live or self._live_lease(conn, now):
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = 'Job abandoned by its worker', finished_at = ? "
+                "WHERE status = 'running'",
+                (datetime.now().isoformat(),),
+            )
+            cur = conn.execute(
+                "INSERT INTO jobs (status, owner, started_at, expires_at) VALUES ('running', ?, ?, ?)",
+                (owner or worker_id(), datetime.now().isoformat(), now + self.job_timeout + 60),
+            )
+            return cur.lastrowid
+
+    def _live_lease(self, conn, now):
+        placeholders = ",".join("?" * len(EXCLUSIVE_LEASES))
+        return conn.execute(
+            f"SELECT name FROM leases WHERE name IN ({placeholders}) AND expires_at > ?",
+            (*EXCLUSIVE_LEASES, now),
+        ).fetchone()
+
+    def blocking_lease(self):
+        """Name of the live lease that keeps analysis jobs from starting, or None."""
+        with self._connect() as conn:
+            row = self._live_lease(conn, time.time())
+        return row["name"] if row else None
+
+    def finish_job(self, job_id, error=None, posts_count=0, sentiment_count=0):
+        with self._write() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ?, posts_count = ?, sentiment_count = ? "
+                "WHERE id = ?",
+                ("failed" if error else "done", error, datetime.now().isoformat(),
+                 posts_count, sentiment_count, job_id),
+            )
+
+    def status(self):
+        """Same shape the API has always returned from /api/status."""
+        with self._connect() as conn:
+            running = conn.execute(
+                "SELECT 1 FROM jobs WHERE status = 'running' AND expires_at > ?", (time.time(),)
+            ).fetchone()
+            last = conn.execute(
+                "SELECT * FROM jobs WHERE status != 'running' ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+            last_ok = conn.execute(
+                "SELECT finished_at FROM jobs WHERE status = 'done' ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+            counts = {row["kind"]: row["count"] for row in conn.execute("SELECT kind, count FROM snapshots")}
+        return {
+            "is_running": running is not None,
+            "last_run": last_ok["finished_at"] if last_ok else None,
+            "error": last["error"] if last and not running else None,
+            "posts_count": counts.get("posts", 0),
+            "sentiment_count": counts.get("sentiment", 0),
+        }
+
+    # --- result snapshots ---
+    def publish_snapshot(self, kind, data):
+        """Store a new version of a result set. Returns the new version number."""
+        payload = json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+        with self._write() as conn:
+            row = conn.execute("SELECT version FROM snapshots WHERE kind = ?", (kind,)).fetchone()
+            version = (row["version"] if row else 0) + 1
+            conn.execute(
+                "INSERT OR REPLACE INTO snapshots (kind, version, payload, count, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (kind, version, payload, len(data), datetime.now().isoformat()),
+            )
+        return version
+
+    def get_snapshot(self, kind):
+        """Latest snapshot as a dict with version/token/payload/count/updated_at, or None."""
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT s.*, {SNAPSHOT_TOKEN} FROM snapshots s "
+                "JOIN meta m ON m.key = 'store_id' WHERE s.kind = ?", (kind,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def get_snapshot_info(self, kind):
+        """Token and updated_at without the payload, so readers can check their cache cheaply."""
+        with self._connect() as conn:
+            row = conn.execute(
+                f"SELECT {SNAPSHOT_TOKEN}, s.updated_at FROM snapshots s "
+                "JOIN meta m ON m.key = 'store_id' WHERE s.kind = ?", (kind,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    # --- leases ---
+    def acquire_lease(self, name, owner=None, ttl=60):
+        """
+        Take or renew a named lease. Returns True if `owner` holds it afterwards.
+        Exclusive leases cannot be taken while an analysis job is running.
+        """
+        owner = owner or worker_id()
+        now = time.time()
+        with self._write() as conn:
+            if name in EXCLUSIVE_LEASES and conn.execute(
+                "SELECT 1 FROM jobs WHERE status = 'running' AND expires_at > ?", (now,)
+            ).fetchone():
+                return False
+            row = conn.execute("SELECT owner, expires_at FROM leases WHERE name = ?", (name,)).fetchone()
+            if row and row["owner"] != owner and row["expires_at"] > now:
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO leases (name, owner, expires_at) VALUES (?, ?, ?)",
+                (name, owner, now + ttl),
+            )
+            return True
+
+    def release_lease(self, name, owner=None):
+        with self._write() as conn:
+            conn.execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner or worker_id()))
@@ -0,0 +1,132 @@
+"""
+Fast JSON encoding and negotiated compression for the large API responses.
+
+  - dumps() uses orjson when installed, else compact stdlib json
+  - FastJSONResponse renders with dumps(); FastAPI still runs jsonable_encoder on
+    dicts a handler returns, so return an instance directly to skip that walk too
+  - CompressedBodyCache keeps gzip/brotli bodies per (key, snapshot version), so
+    a snapshot is encoded and compressed once and then served as bytes
+"""
+
+import gzip
+import json
+import threading
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to compact stdlib json
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only without it
+    brotli = None
+
+# Below this size compression costs more than it saves
+MIN_COMPRESS_SIZE = 1024
+
+
+def dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with dumps(). Content must already be plain JSON types.
+    As default_response_class only render() changes; returning a FastJSONResponse
+    from a handler also bypasses FastAPI's jsonable_encoder.
+    """
+
+    def render(self, content) -> bytes:
+        return dumps(content)
+
+
+def accepted_encodings(request: Request):
+    """Content-codings listed in Accept-Encoding, minus any refused with q=0."""
+    accepted = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        name, _, params = part.partition(";")
+        if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(name.strip().lower())
+    return accepted
+
+def pick_encoding(request: Request):
+    """Best content-coding we can produce that the client accepts: br, then gzip, else None."""
+    accepted = accepted_encodings(request)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def etag_matches(request: Request, etag):
+    """
+    If-None-Match check: a comma-separated list or "*", compared weakly (W/ ignored),
+    since proxies that recompress bodies weaken or list the validators they forward.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def _compress(body: bytes, encoding):
+    if encoding == "br":
+        return brotli.compress(body, quality=5)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6)
+    return body
+
+
+class CompressedBodyCache:
+    """
+    Per-process cache of encoded response bodies.
+    Holds one version per key; a newer snapshot version evicts the old bodies.
+
+    Reading, encoding and compressing happen outside the lock, so a slow rebuild
+    never blocks requests for other keys; two racing rebuilds just do the work twice.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}  # key -> (probe, version, {encoding: bytes})
+
+    def _entry(self, key, probe, build):
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is not None and cached[0] == probe:
+            return cached
+        version, body = build()
+        cached = (probe, version, {None: body})
+        with self._lock:
+            self._entries[key] = cached
+        return cached
+
+    def respond(self, request: Request, key, probe, build):
+        """
+        Response for `key`. `probe` is a cheap token that changes whenever the data
+        does; `build()` reads the data once and returns (version, uncompressed JSON
+        bytes). The ETag uses the version build() saw, so it always matches the body.
+        """
+        _, version, bodies = self._entry(key, probe, build)
+        encoding = pick_encoding(request)
+        if len(bodies[None]) < MIN_COMPRESS_SIZE:
+            encoding = None
+        etag = f'"{key}-{version}-{encoding or "identity"}"'
+        headers = {"Vary": "Accept-Encoding", "ETag": etag}
+        if etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+        body = bodies.get(encoding)
+        if body is None:
+            body = bodies[encoding] = _compress(bodies[None], encoding)
+        if encoding is not None:
+            headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
@@ -18,13 +18,17 @@ def make_client():
     reddit.read_only = True
     return reddit
 
-def fetch_wsb_posts(limit=1000, only_dd=False, comments_per_post=0, source="new"):
+def fetch_wsb_posts(limit=1000, only_dd=False, comments_per_post=0, source="new",
+                    seen_ids=None, save=True):
     """
     Fetch up to `limit` posts from r/wallstreetbets.
     - only_dd: keep only posts whose flair contains 'dd' (case-insensitive)
     - comments_per_post=0 initially to reduce rate pressure while debugging
     - source: 'new' | 'hot' | 'top'
+    - seen_ids: post ids to skip without pacing (used by the ingestion daemon)
+    - save: write posts_<ts>.json and posts.json (the daemon persists on its own)
     """
+    seen_ids = seen_ids or set()
     reddit = make_client()
     sr = reddit.subreddit("wallstreetbets")
 
@@ -36,9 +40,13 @@ def fetch_wsb_posts(limit=1000, only_dd=False, comments_per_post=0, source="new"
     else:
         listing = sr.new(limit=limit * 10)
 
-    kept, skipped = [], {"stickied": 0, "flair": 0, "empty": 0}
+    kept, skipped = [], {"stickied": 0, "flair": 0, "empty": 0, "seen": 0}
 
     for submission in listing:
+        if submission.id in seen_ids:
+            skipped["seen"] += 1
+            continue
+
         time.sleep(1.5 + random.random())  # polite pacing 1.5–2.5s
 
         if getattr(submission, "stickied", False):
@@ -83,18 +91,22 @@ def fetch_wsb_posts(limit=1000, only_dd=False, comments_per_post=0, source="new"
             "permalink": f"https://www.reddit.com{submission.permalink}",
             "score": submission.score,
             "num_comments": submission.num_comments,
+            "created_utc": submission.created_utc,
         })
 
         if len(kept) >= limit:
             break
 
+    if not save:
+        return kept
+
     # Save with a timestamped filename so you can inspect it
     ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     out = Path(f"posts_{ts}.json")
-    out.write_text(json.dumps(kept, indent=2, ensure_ascii=False), encoding="utf-8")
+    out.write_text(json.dumps(kept, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
 
     # Also refresh the canonical posts.json pointer for your sentiment script
-    Path("posts.json").write_text(json.dumps(kept, indent=2, ensure_ascii=False), encoding="utf-8")
+    Path("posts.json").write_text(json.dumps(kept, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
 
     print(f"Saved {len(kept)} posts -> {out.resolve()}")
     print(f"   Skipped: {skipped}")
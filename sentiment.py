@@ -6,6 +6,9 @@ import nltk
 import emoji as emoji_lib
 import re
 
+from comentions import CoMentionIndex
+from exporter import export_snapshots
+
 # Ensure VADER + stopwords are available
 nltk.download("vader_lexicon", quiet=True)
 nltk.download("stopwords", quiet=True)
@@ -124,13 +127,24 @@ def run_sentiment():
         res["id"] = post["id"]
         res["title"] = post["title"]
         res["permalink"] = post["permalink"]
+        res["created_utc"] = post.get("created_utc")
         results.append(res)
         print(f"{post['title'][:60]}... → {res['label']} ({res['compound']}) | Tickers: {res['tickers']}")
 
     with open("sentiment_results.json", "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+        json.dump(results, f, ensure_ascii=False, separators=(",", ":"))
 
     print("✅ Sentiment results saved to sentiment_results.json")
 
+    # Fold this batch into the ticker co-mention index
+    index = CoMentionIndex.load()
+    added = index.update(results)
+    index.save()
+    print(f"Co-mention index updated with {added} new posts")
+
+    # Shard results into pre-compressed static snapshots for the dashboard
+    manifest = export_snapshots(results)
+    print(f"Exported {len(manifest['tickers'])} ticker and {len(manifest['days'])} day snapshots")
+
 if __name__ == "__main__":
     run_sentiment()